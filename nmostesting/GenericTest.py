@@ -20,6 +20,7 @@ import traceback
 import inspect
 import uuid
 import time
+import functools
 
 from . import TestHelper
 from .NMOSUtils import NMOSUtils
@@ -32,6 +33,12 @@ from .mocks.Auth import AuthServer
 NMOS_WIKI_URL = "https://github.com/AMWA-TV/nmos/wiki"
 
 
+@functools.lru_cache(maxsize=None)
+def load_error_schema():
+    """Load the generic 4xx/5xx error schema, which is shared by all test suites and never changes during a run"""
+    return TestHelper.load_resolved_schema("test_data/core", "error.json", path_prefix=False)
+
+
 def test_depends(func):
     """Decorator to prevent a test being executed in individual mode"""
 
@@ -69,6 +76,7 @@ class GenericTest(object):
         self.auto_test_count = 0
         self.test_individual = False
         self.result = list()
+        self.schema_validators = {}
         self.protocol = "http"
         self.ws_protocol = "ws"
         if CONFIG.ENABLE_HTTPS:
@@ -253,7 +261,7 @@ class GenericTest(object):
         if method.upper() == "OPTIONS" and expect_headers is not None:
             if 'Access-Control-Allow-Headers' not in headers:
                 return False, "'Access-Control-Allow-Headers' not in CORS headers: {}".format(headers)
-            current_headers = [x.strip().upper() for x in headers['Access-Control-Allow-Headers'].split(",")]
+            current_headers = {x.strip().upper() for x in headers['Access-Control-Allow-Headers'].split(",")}
             for cors_header in expect_headers:
                 if cors_header.upper() not in current_headers:
                     return False, "'{}' not in 'Access-Control-Allow-Headers' CORS header: {}" \
@@ -261,7 +269,7 @@ class GenericTest(object):
         if method.upper() == "OPTIONS" and expect_methods is not None:
             if 'Access-Control-Allow-Methods' not in headers:
                 return False, "'Access-Control-Allow-Methods' not in CORS headers: {}".format(headers)
-            current_methods = [x.strip().upper() for x in headers['Access-Control-Allow-Methods'].split(",")]
+            current_methods = {x.strip().upper() for x in headers['Access-Control-Allow-Methods'].split(",")}
             for cors_method in expect_methods:
                 if cors_method.upper() not in current_methods:
                     return False, "'{}' not in 'Access-Control-Allow-Methods' CORS header: {}" \
@@ -353,7 +361,7 @@ class GenericTest(object):
 
     def check_error_response(self, method, response, code):
         """Confirm that a given Requests response conforms to the 4xx/5xx error schema and has any expected headers"""
-        schema = TestHelper.load_resolved_schema("test_data/core", "error.json", path_prefix=False)
+        schema = load_error_schema()
         valid, message = self.check_response(schema, method, response)
         if valid:
             if response.json()["code"] != code:
@@ -367,8 +375,28 @@ class GenericTest(object):
         Validate the payload under the given schema.
         Raises an exception if the payload (or schema itself) is invalid
         """
+        validator = self.get_schema_validator(schema)
+        error = jsonschema.exceptions.best_match(validator.iter_errors(payload))
+        if error is not None:
+            raise error
+
+    def get_schema_validator(self, schema):
+        """
+        Get a validator for the given schema, checking and compiling the schema on first use only.
+        Validators are cached by schema identity, so schemas which are reused avoid repeated compilation.
+        Schemas must therefore not be modified after first use; pass a new dict for a changed schema instead.
+        """
+        cached = self.schema_validators.get(id(schema))
+        # Hold a reference to the schema alongside its validator so that its id cannot be reused
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+
+        cls = jsonschema.validators.validator_for(schema)
+        cls.check_schema(schema)
         checker = jsonschema.FormatChecker(["ipv4", "ipv6", "uri"])
-        jsonschema.validate(payload, schema, format_checker=checker)
+        validator = cls(schema, format_checker=checker)
+        self.schema_validators[id(schema)] = (schema, validator)
+        return validator
 
     def do_request(self, method, url, **kwargs):
         return TestHelper.do_request(method=method, url=url, **kwargs)
@@ -707,7 +735,7 @@ class GenericTest(object):
             schema = self.apis[api_name]["spec"].get_schema(method, path, status_code)
         except KeyError:
             if status_code // 100 in [4, 5]:
-                schema = TestHelper.load_resolved_schema("test_data/core", "error.json", path_prefix=False)
+                schema = load_error_schema()
             else:
                 raise
         return schema
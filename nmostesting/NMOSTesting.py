@@ -749,15 +749,16 @@ def format_test_results(results, endpoints, format, args):
             test_cases.append(test_case)
         formatted = TestSuite(results["def"]["name"] + ": " + ", ".join(results["urls"]), test_cases)
     elif format == "console":
-        formatted = "\r\nPrinting test results for suite '{}' using API(s) '{}'\r\n" \
-                    .format(results["suite"], ", ".join(results["urls"]))
-        formatted += "----------------------------\r\n"
+        lines = ["\r\nPrinting test results for suite '{}' using API(s) '{}'\r\n"
+                 .format(results["suite"], ", ".join(results["urls"]))]
+        lines.append("----------------------------\r\n")
         for test_result in results["result"]:
             num_extra_dots = max_name_len - len(test_result.name)
             test_state = str(TestStates.DISABLED if test_result.name in ignored_tests else test_result.state)
-            formatted += "{} ...{} {}\r\n".format(test_result.name, ("." * num_extra_dots), test_state)
-        formatted += "----------------------------\r\n"
-        formatted += "Ran {} tests in ".format(len(results["result"])) + "{0:.3f}s".format(total_time) + "\r\n"
+            lines.append("{} ...{} {}\r\n".format(test_result.name, ("." * num_extra_dots), test_state))
+        lines.append("----------------------------\r\n")
+        lines.append("Ran {} tests in ".format(len(results["result"])) + "{0:.3f}s".format(total_time) + "\r\n")
+        formatted = "".join(lines)
     return formatted
 
 
@@ -829,23 +830,20 @@ def validate_args(args, access_type="cli"):
     msg = ""
     return_type = ExitCodes.OK
     if args.list_suites:
-        for test_suite in sorted(TEST_DEFINITIONS):
-            msg += test_suite + '\n'
+        msg = "".join(test_suite + '\n' for test_suite in sorted(TEST_DEFINITIONS))
     elif args.describe_suites:
-        for test_suite in sorted(TEST_DEFINITIONS):
-            msg += test_suite + ": " + TEST_DEFINITIONS[test_suite]["name"] + '\n'
+        msg = "".join(test_suite + ": " + TEST_DEFINITIONS[test_suite]["name"] + '\n'
+                      for test_suite in sorted(TEST_DEFINITIONS))
     elif "suite" in vars(args):
         if args.suite not in TEST_DEFINITIONS:
             msg = "ERROR: The requested test suite '{}' does not exist".format(args.suite)
             return_type = ExitCodes.ERROR
         elif args.list_tests:
             tests = enumerate_tests(TEST_DEFINITIONS[args.suite]["class"])
-            for test_name in tests:
-                msg += test_name + '\n'
+            msg = "".join(test_name + '\n' for test_name in tests)
         elif args.describe_tests:
             tests = enumerate_tests(TEST_DEFINITIONS[args.suite]["class"], describe=True)
-            for test_description in tests:
-                msg += test_description + '\n'
+            msg = "".join(test_description + '\n' for test_description in tests)
         elif getattr(args, "selection", "all") not in enumerate_tests(TEST_DEFINITIONS[args.suite]["class"]):
             msg = "ERROR: Test with name '{}' does not exist in test suite '{}'".format(args.selection,
                                                                                         args.suite)
@@ -25,13 +25,13 @@ import os
 import jsonref
 import netifaces
 import paho.mqtt.client as mqtt
-from copy import copy
 from pathlib import Path
 from enum import IntEnum
 from numbers import Number
 from functools import cmp_to_key
 from collections.abc import KeysView
 from urllib.parse import urlparse
+from urllib.request import url2pathname
 
 from . import Config as CONFIG
 
@@ -71,6 +71,9 @@ class JsonType(IntEnum):
 
     @classmethod
     def _cmp_json(cls, json1, json2):
+        # the same object is trivially equal, so avoid walking it
+        if json1 is json2:
+            return 0
         # compare JSON type first
         t1 = cls.of(json1)
         t2 = cls.of(json2)
@@ -221,6 +224,28 @@ def do_request(method, url, headers=None, **kwargs):
         print("{} {} {}".format(method.upper(), url, response.status_code if response is not None else "<no response>"))
 
 
+# Parsed JSON documents referenced by schemas, keyed by URI, along with the modification time of the source file
+_schema_document_cache = {}
+
+
+def load_schema_document(uri):
+    """
+    Loads the JSON document referred to by a URI. Local files are parsed once and reused until modified,
+    as the same referenced schemas (e.g. resource_core.json) are resolved many times during a test run.
+    """
+    url = urlparse(uri)
+    if url.scheme != "file":
+        return jsonref.jsonloader(uri)
+
+    mtime = os.path.getmtime(url2pathname(url.path))
+    cached = _schema_document_cache.get(uri)
+    if cached is None or cached[0] != mtime:
+        # jsonref copies documents while replacing references, so the cached document is never modified
+        cached = (mtime, jsonref.jsonloader(uri))
+        _schema_document_cache[uri] = cached
+    return cached[1]
+
+
 def load_resolved_schema(spec_path, file_name=None, schema_obj=None, path_prefix=True):
     """
     Parses JSON as well as resolves any `$ref`s, including references to
@@ -250,7 +275,7 @@ def load_resolved_schema(spec_path, file_name=None, schema_obj=None, path_prefix
             # rather than recreate the cache path from config, cheat by just using the original base URI
             uri = base_uri_path + uri[len(is07_base_uri):]
 
-        return jsonref.jsonloader(uri)
+        return load_schema_document(uri)
 
     if file_name:
         json_file = str(Path(base_path) / file_name)
@@ -264,6 +289,15 @@ def load_resolved_schema(spec_path, file_name=None, schema_obj=None, path_prefix
     return schema
 
 
+def wait_for_state(state_changed, predicate, timeout):
+    """
+    Block until predicate returns True or the timeout (seconds) expires, returning the final result of predicate.
+    The predicate is checked again each time the state_changed condition is notified, e.g. by a WebsocketWorker
+    """
+    with state_changed:
+        return state_changed.wait_for(predicate, timeout)
+
+
 def check_content_type(headers, expected_type="application/json"):
     """Check the Content-Type header of an API request or response"""
     if "Content-Type" not in headers:
@@ -287,10 +321,11 @@ def check_content_type(headers, expected_type="application/json"):
 class WebsocketWorker(threading.Thread):
     """Websocket Client Worker Thread"""
 
-    def __init__(self, ws_href):
+    def __init__(self, ws_href, state_changed=None):
         """
         Initializer
         :param ws_href: websocket url (string)
+        :param state_changed: notified on open, message, close or error, may be shared (threading.Condition)
         """
         if CONFIG.ENABLE_AUTH and CONFIG.AUTH_TOKEN and "access_token" not in ws_href:
             if "?" in ws_href:
@@ -313,6 +348,7 @@ class WebsocketWorker(threading.Thread):
         self.error_occurred = False
         self.connected = False
         self.error_message = ""
+        self.state_changed = state_changed if state_changed is not None else threading.Condition()
 
     def run(self):
         url = urlparse(self.ws.url)
@@ -324,17 +360,25 @@ class WebsocketWorker(threading.Thread):
 
     def on_open(self, ws):
         self.connected = True
+        self.notify_state_changed()
 
     def on_message(self, ws, message):
         self.messages.append(message)
+        self.notify_state_changed()
 
     def on_close(self, ws, close_status, close_message):
         self.connected = False
+        self.notify_state_changed()
 
     def on_error(self, ws, error):
         self.error_occurred = True
         self.error_message = error
         self.connected = False
+        self.notify_state_changed()
+
+    def notify_state_changed(self):
+        with self.state_changed:
+            self.state_changed.notify_all()
 
     def close(self):
         self.ws.close()
@@ -347,8 +391,9 @@ class WebsocketWorker(threading.Thread):
         return self.connected
 
     def get_messages(self):
-        msg_cpy = copy(self.messages)
-        self.clear_messages()  # Reset message list after reading
+        # Hand over the current message list and start a new one, rather than copying and then clearing,
+        # which would discard any message received in between
+        msg_cpy, self.messages = self.messages, list()
         return msg_cpy
 
     def did_error_occur(self):
@@ -363,7 +408,7 @@ class WebsocketWorker(threading.Thread):
 
 class MQTTClientWorker:
     """MQTT Client Worker"""
-    def __init__(self, host, port, secure=False, username=None, password=None, topics=[]):
+    def __init__(self, host, port, secure=False, username=None, password=None, topics=[], state_changed=None):
         """
         Initializer
         :param host: broker hostname (string)
@@ -372,6 +417,7 @@ class MQTTClientWorker:
         :param username: broker username (string)
         :param password: broker password (string)
         :param topics: list of topics to subscribe to (list of string)
+        :param state_changed: notified on connect, message, disconnect or error, may be shared (threading.Condition)
         """
         self.host = host
         self.port = port
@@ -393,6 +439,7 @@ class MQTTClientWorker:
         self.topics = topics
         self.pending_subs = set()
         self.messages = []
+        self.state_changed = state_changed if state_changed is not None else threading.Condition()
 
     def start(self):
         self.client.connect_async(self.host, self.port)
@@ -404,6 +451,7 @@ class MQTTClientWorker:
     def on_connect(self, flags, rc):
         if len(self.topics) == 0:
             self.connected = True
+            self.notify_state_changed()
         else:
             for topic in self.topics:
                 result, message_id = self.client.subscribe(topic, options=mqtt.SubscribeOptions(retainAsPublished=True))
@@ -416,6 +464,7 @@ class MQTTClientWorker:
             self.pending_subs.remove(message_id)
             if len(self.pending_subs) == 0:
                 self.connected = True
+                self.notify_state_changed()
         else:
             print("Unexpected suback message ID: {}".format(message_id))
 
@@ -439,16 +488,23 @@ class MQTTClientWorker:
         if rc != mqtt.MQTT_ERROR_SUCCESS:
             self.error_occurred = True
             self.error_message = "disconnected with rc {}".format(rc)
+        self.notify_state_changed()
 
     def on_message(self, message):
         self.messages.append(message)
+        self.notify_state_changed()
 
     def on_log(self, level, buf):
         if level == mqtt.MQTT_LOG_ERR:
             self.error_occurred = True
             self.error_message = buf
+            self.notify_state_changed()
         print("MQTT log: {}: {}".format(level, buf))
 
+    def notify_state_changed(self):
+        with self.state_changed:
+            self.state_changed.notify_all()
+
 
 class SubscriptionWebsocketWorker(threading.Thread):
     """Subscription Server Worker Thread"""
@@ -1278,11 +1278,11 @@ class IS0402Test(GenericTest):
                     unexpected_nodes.append(node_id)
 
             # Collect ids of added nodes
-            posted_node_ids = list()
+            posted_node_ids = set()
             for curr_data in sub_data[api_version]:
                 if "pre" not in curr_data and "post" in curr_data:  # Only check the 'Added Event'
                     if "id" in curr_data["post"]:
-                        posted_node_ids.append(curr_data["post"]["id"])
+                        posted_node_ids.add(curr_data["post"]["id"])
 
             # Check for expected nodes
             for expected_node_id in expected_nodes:
@@ -1176,9 +1176,12 @@ class IS0501Test(GenericTest):
                             except IndexError:
                                 return False, "Number of 'legs' in constraints does not match the number in " \
                                               "transport_params"
-                            schema["items"]["$schema"] = "http://json-schema.org/draft-04/schema#"
+                            # Validators are cached per schema object, so each leg needs a fresh dict in order
+                            # for the combined constraints to be checked again
+                            leg_schema = dict(schema["items"])
+                            leg_schema["$schema"] = "http://json-schema.org/draft-04/schema#"
                             try:
-                                self.validate_schema(params, schema["items"])
+                                self.validate_schema(params, leg_schema)
                             except ValidationError as e:
                                 return False, "Staged endpoint does not comply with constraints in leg {}: " \
                                               "{}".format(count, str(e))
@@ -15,6 +15,7 @@
 import re
 import time
 import json
+import threading
 from collections import namedtuple
 from enum import Enum, auto
 
@@ -24,7 +25,7 @@ from ..IS04Utils import IS04Utils
 from ..IS05Utils import IS05Utils
 from ..IS07Utils import IS07Utils
 
-from ..TestHelper import WebsocketWorker, MQTTClientWorker
+from ..TestHelper import WebsocketWorker, MQTTClientWorker, wait_for_state
 
 EVENTS_API_KEY = "events"
 NODE_API_KEY = "node"
@@ -282,11 +283,15 @@ class IS0702Test(GenericTest):
         connection_sources = self.get_websocket_connection_sources(test)
 
         if len(connection_sources) > 0:
+            # All the WebSocket clients notify the same condition, so that a change to any one of them
+            # can be reported as soon as it happens
+            state_changed = threading.Condition()
             websockets_no_health = {}
             websockets_with_health = {}
             for connection_uri in connection_sources:
-                websockets_no_health[connection_uri] = WebsocketWorker(connection_uri)
-                websockets_with_health[connection_uri] = WebsocketWorker(connection_uri)
+                websockets_no_health[connection_uri] = WebsocketWorker(connection_uri, state_changed)
+                websockets_with_health[connection_uri] = WebsocketWorker(connection_uri, state_changed)
+            all_websockets = list(websockets_no_health.values()) + list(websockets_with_health.values())
 
             for connection_uri in websockets_no_health:
                 websockets_no_health[connection_uri].start()
@@ -296,12 +301,9 @@ class IS0702Test(GenericTest):
 
             # Give each WebSocket client a chance to start and open its connection
             start_time = time.time()
-            while time.time() < start_time + CONFIG.WS_MESSAGE_TIMEOUT:
-                no_health_opened = all([websockets_no_health[_].is_open() for _ in websockets_no_health])
-                with_health_opened = all([websockets_with_health[_].is_open() for _ in websockets_with_health])
-                if no_health_opened and with_health_opened:
-                    break
-                time.sleep(0.2)
+            wait_for_state(state_changed,
+                           lambda: all([ws.is_open() or ws.did_error_occur() for ws in all_websockets]),
+                           CONFIG.WS_MESSAGE_TIMEOUT)
 
             # After that short while, they must all be connected successfully
             for websockets in [websockets_no_health, websockets_with_health]:
@@ -314,13 +316,13 @@ class IS0702Test(GenericTest):
                         return test.FAIL("Error opening WebSocket connection to {}".format(connection_uri))
 
             # All WebSocket connections must stay open until a health command is required
-            while time.time() < start_time + WS_HEARTBEAT_INTERVAL:
-                for websockets in [websockets_no_health, websockets_with_health]:
-                    for connection_uri in websockets:
-                        websocket = websockets[connection_uri]
-                        if not websocket.is_open():
-                            return test.FAIL("WebSocket connection to {} was closed too early".format(connection_uri))
-                time.sleep(1)
+            wait_for_state(state_changed,
+                           lambda: not all([ws.is_open() for ws in all_websockets]),
+                           start_time + WS_HEARTBEAT_INTERVAL - time.time())
+            for websockets in [websockets_no_health, websockets_with_health]:
+                for connection_uri in websockets:
+                    if not websockets[connection_uri].is_open():
+                        return test.FAIL("WebSocket connection to {} was closed too early".format(connection_uri))
 
             # send health commands to one set of WebSockets
             health_command = {}
@@ -331,10 +333,9 @@ class IS0702Test(GenericTest):
                 websockets_with_health[connection_uri].send(json.dumps(health_command))
 
             # All WebSocket connections which were sent a health command should respond with a health response
-            while time.time() < start_time + WS_HEARTBEAT_INTERVAL * 2:
-                if all([len(websockets_with_health[_].messages) >= 1 for _ in websockets_with_health]):
-                    break
-                time.sleep(0.2)
+            wait_for_state(state_changed,
+                           lambda: all([len(websockets_with_health[_].messages) >= 1 for _ in websockets_with_health]),
+                           start_time + WS_HEARTBEAT_INTERVAL * 2 - time.time())
 
             for connection_uri in websockets_with_health:
                 websocket = websockets_with_health[connection_uri]
@@ -385,25 +386,25 @@ class IS0702Test(GenericTest):
 
             # All WebSocket connections which haven't been sent a health command must stay opened
             # for a period of time even without any heartbeats
-            while time.time() < start_time + WS_TIMEOUT - 1:
-                for connection_uri in websockets_no_health:
-                    websocket = websockets_no_health[connection_uri]
-                    if not websocket.is_open():
-                        return test.FAIL("WebSocket connection (no health cmd sent) to {} was closed too early"
-                                         .format(connection_uri))
-                time.sleep(1)
+            wait_for_state(state_changed,
+                           lambda: not all([websockets_no_health[_].is_open() for _ in websockets_no_health]),
+                           start_time + WS_TIMEOUT - 1 - time.time())
+            for connection_uri in websockets_no_health:
+                if not websockets_no_health[connection_uri].is_open():
+                    return test.FAIL("WebSocket connection (no health cmd sent) to {} was closed too early"
+                                     .format(connection_uri))
 
             # A short while after that timeout period, and certainly before another IS-07 heartbeat
             # interval has passed, all WebSocket connections which haven't been sent a health command
             # should start being closed down and connections which have been sent a health command
             # should still remain opened
-            while time.time() < start_time + WS_TIMEOUT + WS_HEARTBEAT_INTERVAL:
-                for connection_uri in websockets_with_health:
-                    websocket = websockets_with_health[connection_uri]
-                    if not websocket.is_open():
-                        return test.FAIL("WebSocket connection (health cmd sent) to {} was closed too early"
-                                         .format(connection_uri))
-                time.sleep(1)
+            wait_for_state(state_changed,
+                           lambda: not all([websockets_with_health[_].is_open() for _ in websockets_with_health]),
+                           start_time + WS_TIMEOUT + WS_HEARTBEAT_INTERVAL - time.time())
+            for connection_uri in websockets_with_health:
+                if not websockets_with_health[connection_uri].is_open():
+                    return test.FAIL("WebSocket connection (health cmd sent) to {} was closed too early"
+                                     .format(connection_uri))
 
             # Now, all WebSocket connections which haven't been sent a health command must all be disconnected
             for connection_uri in websockets_no_health:
@@ -413,10 +414,9 @@ class IS0702Test(GenericTest):
                                      .format(connection_uri))
 
             # WebSocket connections which have been sent a health command should start being closed down now
-            while time.time() < start_time + WS_TIMEOUT + WS_HEARTBEAT_INTERVAL * 2:
-                if all([not websockets_with_health[_].is_open() for _ in websockets_with_health]):
-                    break
-                time.sleep(0.2)
+            wait_for_state(state_changed,
+                           lambda: not any([websockets_with_health[_].is_open() for _ in websockets_with_health]),
+                           start_time + WS_TIMEOUT + WS_HEARTBEAT_INTERVAL * 2 - time.time())
 
             # Now, they must all be disconnected
             for connection_uri in websockets_with_health:
@@ -436,19 +436,19 @@ class IS0702Test(GenericTest):
         connection_sources = self.get_websocket_connection_sources(test)
 
         if len(connection_sources) > 0:
+            state_changed = threading.Condition()
             target_websockets = {}
             for connection_uri in connection_sources:
-                target_websockets[connection_uri] = WebsocketWorker(connection_uri)
+                target_websockets[connection_uri] = WebsocketWorker(connection_uri, state_changed)
 
             for connection_uri in target_websockets:
                 target_websockets[connection_uri].start()
 
             # Give each WebSocket client a chance to start and open its connection
             start_time = time.time()
-            while time.time() < start_time + CONFIG.WS_MESSAGE_TIMEOUT:
-                if all([target_websockets[_].is_open() for _ in target_websockets]):
-                    break
-                time.sleep(0.2)
+            wait_for_state(state_changed,
+                           lambda: all([ws.is_open() or ws.did_error_occur() for ws in target_websockets.values()]),
+                           CONFIG.WS_MESSAGE_TIMEOUT)
 
             # After that short while, they must all be connected successfully
             for connection_uri in target_websockets:
@@ -481,15 +481,17 @@ class IS0702Test(GenericTest):
                             return test.FAIL("WebSocket {} message cannot be parsed, "
                                              "exception {}, original message: {}"
                                              .format(connection_uri, e, message))
-                time.sleep(1)
+                wait_for_state(state_changed,
+                               lambda: any([len(target_websockets[_].messages) > 0 for _ in target_websockets]),
+                               start_time + WS_HEARTBEAT_INTERVAL - time.time())
 
             # Test run 1
             self.websocket_state_messages_test_run(
-                test, target_websockets, connection_sources, start_time + WS_HEARTBEAT_INTERVAL * 2, 1)
+                test, target_websockets, state_changed, connection_sources, start_time + WS_HEARTBEAT_INTERVAL * 2, 1)
 
             # Test run 2 (will resend subscriptions)
             self.websocket_state_messages_test_run(
-                test, target_websockets, connection_sources, start_time + WS_HEARTBEAT_INTERVAL * 3, 2)
+                test, target_websockets, state_changed, connection_sources, start_time + WS_HEARTBEAT_INTERVAL * 3, 2)
 
             return test.PASS()
         else:
@@ -502,6 +504,7 @@ class IS0702Test(GenericTest):
         broker_senders = self.get_mqtt_broker_senders(test)
         warning = None
         if len(broker_senders) > 0:
+            state_changed = threading.Condition()
             target_brokers = {}
             for broker_params in broker_senders:
                 topics = set()
@@ -515,18 +518,16 @@ class IS0702Test(GenericTest):
                     broker_params.protocol == "secure-mqtt",
                     CONFIG.MQTT_USERNAME,
                     CONFIG.MQTT_PASSWORD,
-                    list(topics))
+                    list(topics),
+                    state_changed)
             for broker_params in broker_senders:
                 target_brokers[broker_params].start()
 
             # Give each MQTT client a chance to start and connect to the broker
-            start_time = time.time()
-            while time.time() < start_time + CONFIG.MQTT_MESSAGE_TIMEOUT:
-                if all([target_brokers[_].is_open() for _ in target_brokers]):
-                    break
-                if any([target_brokers[_].did_error_occur() for _ in target_brokers]):
-                    break
-                time.sleep(0.2)
+            wait_for_state(state_changed,
+                           lambda: (all([target_brokers[_].is_open() for _ in target_brokers]) or
+                                    any([target_brokers[_].did_error_occur() for _ in target_brokers])),
+                           CONFIG.MQTT_MESSAGE_TIMEOUT)
 
             # After that short while, they must all be connected successfully
             for broker_params in target_brokers:
@@ -755,7 +756,8 @@ class IS0702Test(GenericTest):
                                         broker_senders[broker].append(sender)
         return broker_senders
 
-    def websocket_state_messages_test_run(self, test, target_websockets, connection_sources, end_time, run_number):
+    def websocket_state_messages_test_run(self, test, target_websockets, state_changed, connection_sources, end_time,
+                                          run_number):
         """WebSocket state messages checks test run"""
 
         # Create health commands
@@ -773,10 +775,9 @@ class IS0702Test(GenericTest):
             target_websockets[connection_uri].send(json.dumps(subscription_command))
 
         # All WebSocket connections which were sent commands should have responded
-        while time.time() < end_time:
-            if all([len(target_websockets[_].messages) >= 2 for _ in target_websockets]):
-                break
-            time.sleep(0.2)
+        wait_for_state(state_changed,
+                       lambda: all([len(target_websockets[_].messages) >= 2 for _ in target_websockets]),
+                       end_time - time.time())
 
         # Check all state messages
         for connection_uri in target_websockets: